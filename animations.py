@@ -2,11 +2,15 @@
 Animation utilities for the prize drawing application.
 """
 import streamlit as st
+import streamlit.components.v1 as components
+import functools
+import html
 import time
-import random
 from sounds import play_sound
+from rng import get_rng
+from sampler import TicketSampler
 
-def draw_animation(participants, duration=10.0, steps=50):
+def draw_animation(participants, duration=10.0, steps=50, sampler=None, rng=None):
     """
     Create an animation for the drawing process.
     
@@ -14,6 +18,9 @@ def draw_animation(participants, duration=10.0, steps=50):
         participants: List of dictionaries with name and tickets
         duration: Total animation duration in seconds
         steps: Number of animation steps
+        sampler: Optional TicketSampler restricting the draw to eligible
+            participants
+        rng: Random generator used for the winning draw
         
     Returns:
         The winning participant
@@ -34,10 +41,13 @@ def draw_animation(participants, duration=10.0, steps=50):
     
     time.sleep(2)
     
-    # Create the ticket pool like in the original script
-    ticket_pool = []
-    for p in participants:
-        ticket_pool.extend([p] * p["tickets"])
+    # Pre-draw the names to flash, weighted by tickets, in one batch; the
+    # sampler works on ticket totals, so this never expands a ticket pool
+    if sampler is None:
+        sampler = TicketSampler.from_participants(participants)
+    flashes = []
+    if sampler.total > 0:
+        flashes = sampler.draw(get_rng(), size=max(steps, int(duration / 0.1) + 1)).tolist()
     
     # Show animation message
     animation_placeholder.markdown(f"""
@@ -53,8 +63,8 @@ def draw_animation(participants, duration=10.0, steps=50):
     tick_count = 0
     while time.time() - start_time < duration:
         # Select a random participant to show
-        if ticket_pool:
-            selected = random.choice(ticket_pool)
+        if flashes:
+            selected = participants[flashes[tick_count % len(flashes)]]
             
             # Display with animation effect
             animation_placeholder.markdown(f"""
@@ -77,7 +87,7 @@ def draw_animation(participants, duration=10.0, steps=50):
                 time.sleep(0.1)
     
     # Select the actual winner
-    winner = select_winner(participants)
+    winner = select_winner(participants, sampler, rng)
     
     # Display the winner with a celebration effect
     animation_placeholder.markdown(f"""
@@ -88,34 +98,108 @@ def draw_animation(participants, duration=10.0, steps=50):
     
     return winner
 
-def select_winner(participants):
+def select_winner(participants, sampler=None, rng=None):
     """
     Select a winner based on ticket distribution.
     
     Args:
         participants: List of dictionaries with name and tickets
+        sampler: Optional TicketSampler over the same participants, e.g.
+            one restricted to eligible entries
+        rng: Random generator from rng.get_rng (standard mode by default)
         
     Returns:
         Dictionary with the winner's name and tickets
     """
-    # Create a ticket pool with each name appearing according to their ticket count
-    ticket_pool = []
-    for p in participants:
-        ticket_pool.extend([p] * p["tickets"])
+    if rng is None:
+        rng = get_rng()
+    if sampler is None:
+        sampler = TicketSampler.from_participants(participants)
     
     # If no tickets, select randomly from participants
-    if not ticket_pool:
-        return random.choice(participants)
+    if sampler.total <= 0:
+        return participants[rng.integers(len(participants))]
     
-    return random.choice(ticket_pool)
+    return participants[sampler.draw(rng)]
 
-def celebration_animation(winner_name, language="English"):
+# Static celebration asset: keyframes, winner box and emoji cycling all run in
+# the browser, so the server only fills in the winner details.
+CELEBRATION_TEMPLATE = """
+<style>
+body { margin: 0; font-family: "Source Sans Pro", sans-serif; color: #FAFAFA; }
+.celebration { text-align: center; padding: 30px; animation: pulse 1s ease-in-out 5; }
+.winner-box {
+    padding: 20px;
+    border-radius: 10px;
+    text-align: center;
+    margin: 20px 0;
+    animation: winner-pulse 2s infinite;
+}
+@keyframes pulse {
+    0%, 100% { transform: scale(1); }
+    50% { transform: scale(1.05); }
+}
+@keyframes winner-pulse {
+    0% { box-shadow: 0 0 0 0px rgba(255, 215, 0, 0.4); }
+    100% { box-shadow: 0 0 0 20px rgba(255, 215, 0, 0); }
+}
+</style>
+<div class="celebration">
+    <h1 class="emojis">🎉 🏆 ✨</h1>
+    <h2>__CONGRATULATIONS__</h2>
+    <h1>__WINNER__</h1>
+    <h1 class="emojis">🎊 🎈 🥳</h1>
+</div>
+<div class="winner-box">
+    <h1>🏆 __WINNER__ 🏆</h1>
+    <h3>__DETAILS__</h3>
+</div>
+<script>
+const emojis = ["🎉", "🎊", "🏆", "✨", "🎇", "🎈", "🥳", "👏"];
+const rows = document.querySelectorAll(".emojis");
+const finalRows = ["🎉 🏆 ✨", "🎊 🎈 🥳"];
+let cycles = 0;
+const timer = setInterval(() => {
+    if (++cycles > 5) {
+        clearInterval(timer);
+        rows.forEach((row, i) => { row.textContent = finalRows[i]; });
+        return;
+    }
+    const picked = [...emojis].sort(() => Math.random() - 0.5).slice(0, 4).join(" ");
+    rows.forEach((row) => { row.textContent = picked; });
+}, 500);
+</script>
+"""
+
+@functools.lru_cache(maxsize=256)
+def celebration_html(winner_name, congratulations, details=""):
+    """
+    Build the celebration HTML for a winner.
+    
+    Args:
+        winner_name: Name of the winner
+        congratulations: Localized congratulations message
+        details: Extra line shown in the winner box
+        
+    Returns:
+        Self-contained HTML document string
+    """
+    return (CELEBRATION_TEMPLATE
+            .replace("__CONGRATULATIONS__", html.escape(congratulations))
+            .replace("__DETAILS__", html.escape(details))
+            .replace("__WINNER__", html.escape(str(winner_name))))
+
+def celebration_animation(winner_name, language="English", details=""):
     """
     Display a celebration animation for the winner.
     
+    The animation runs client-side, so this returns immediately and does not
+    hold the script thread.
+    
     Args:
         winner_name: Name of the winner
         language: Language for congratulations message
+        details: Extra line shown in the winner box, e.g. the ticket count
     """
     congratulations = {
         "English": "Congratulations!",
@@ -123,30 +207,4 @@ def celebration_animation(winner_name, language="English"):
         "Español": "¡Felicitaciones!"
     }.get(language, "Congratulations!")
     
-    # Create emojis for celebration
-    emojis = ["🎉", "🎊", "🏆", "✨", "🎇", "🎈", "🥳", "👏"]
-    
-    # Display celebration with animation
-    celebration_placeholder = st.empty()
-    
-    for i in range(5):
-        random_emojis = ' '.join(random.sample(emojis, 4))
-        celebration_placeholder.markdown(f"""
-        <div style="text-align:center; padding: 30px; animation: pulse 1s infinite;">
-            <h1>{random_emojis}</h1>
-            <h2>{congratulations}</h2>
-            <h1>{winner_name}</h1>
-            <h1>{random_emojis}</h1>
-        </div>
-        """, unsafe_allow_html=True)
-        time.sleep(0.5)
-    
-    # Final celebration display
-    celebration_placeholder.markdown(f"""
-    <div style="text-align:center; padding: 30px;">
-        <h1>🎉 🏆 ✨</h1>
-        <h2>{congratulations}</h2>
-        <h1>{winner_name}</h1>
-        <h1>🎊 🎈 🥳</h1>
-    </div>
-    """, unsafe_allow_html=True)
+    components.html(celebration_html(winner_name, congratulations, details), height=430)
@@ -10,11 +10,26 @@ import random
 import matplotlib.pyplot as plt
 import io
 import base64
+import os
+import json
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 
-from utils import calculate_probabilities, select_winner, save_to_csv, load_from_csv
+from utils import (select_winner, save_to_csv, load_from_csv,
+                   load_from_parquet, clean_name, normalize_name, group_participants, MERGE_POLICIES)
+from sampler import StratifiedSampler, ticket_total
+from rng import get_rng
+from verification import ParticipantDigest, commit_draw, draw_committed, verify_draw
+from eligibility import EligibilityIndex, exclude_names, exclude_groups, min_tickets
 from animations import draw_animation, celebration_animation
 from localization import get_text, get_available_languages
 from sounds import play_sound
+from profiling import profiler, session_state_sizes, module_cache_sizes
+
+# Largest ticket count the forms accept; browsers lose integer precision above 2**53
+MAX_FORM_TICKETS = (1 << 53) - 1
+
+# Number of participants shown individually in the probability chart
+CHART_TOP_N = 20
 
 # Configure page settings
 st.set_page_config(
@@ -40,6 +55,9 @@ if 'winner' not in st.session_state:
 
 if 'drawing_in_progress' not in st.session_state:
     st.session_state.drawing_in_progress = False
+
+if 'celebration_played' not in st.session_state:
+    st.session_state.celebration_played = False
     
 if 'show_stats' not in st.session_state:
     st.session_state.show_stats = False
@@ -50,27 +68,121 @@ if 'language' not in st.session_state:
 if 'drawing_title' not in st.session_state:
     st.session_state.drawing_title = "體重管理挑戰賽 8888"  # Default title from user example
 
+if 'merge_policy' not in st.session_state:
+    st.session_state.merge_policy = "sum"
+
+if 'merge_report' not in st.session_state:
+    st.session_state.merge_report = None
+
+if 'group_winners' not in st.session_state:
+    st.session_state.group_winners = None
+
+if 'past_winners' not in st.session_state:
+    st.session_state.past_winners = []
+
+# Bumped on every change to the participant list so cached indexes rebuild
+if 'participants_version' not in st.session_state:
+    st.session_state.participants_version = 0
+
+if 'draw_commitment' not in st.session_state:
+    st.session_state.draw_commitment = None
+
+# Random source for drawings; a plain key so it survives reruns in which
+# the toggle is not rendered
+if 'secure_rng' not in st.session_state:
+    st.session_state.secure_rng = False
+
 # Function to get translated text
 def t(key):
     return get_text(key, st.session_state.language)
 
+def participants_changed(change=None, index=None):
+    """
+    Mark the participant list as modified.
+    
+    A single edit ("append", "update" or "delete" at index) is applied to the
+    participant digest in place; any other change drops the digest so it is
+    rebuilt the next time it is needed. Either way the current draw
+    commitment no longer matches the list and is withdrawn.
+    """
+    st.session_state.participants_version += 1
+    st.session_state.draw_commitment = None
+    
+    digest = st.session_state.get("participant_digest")
+    if digest is None:
+        return
+    if change == "append":
+        digest.append(st.session_state.participants[-1])
+    elif change == "update":
+        digest.update(index, st.session_state.participants[index])
+    elif change == "delete":
+        digest.delete(index)
+    else:
+        st.session_state.participant_digest = None
+
+def get_participant_digest():
+    """Return the Merkle digest of the current participant list."""
+    if st.session_state.get("participant_digest") is None:
+        st.session_state.participant_digest = ParticipantDigest(st.session_state.participants)
+    return st.session_state.participant_digest
+
+def get_eligibility_index():
+    """Return the eligibility index for the current participant list."""
+    cached = st.session_state.get("eligibility_index")
+    if cached is None or cached[0] != st.session_state.participants_version:
+        cached = (st.session_state.participants_version,
+                  EligibilityIndex(st.session_state.participants))
+        st.session_state.eligibility_index = cached
+    return cached[1]
+
+def get_stratified_sampler():
+    """Return the group sampler for the current participant list."""
+    cached = st.session_state.get("stratified_sampler")
+    if cached is None or cached[0] != st.session_state.participants_version:
+        cached = (st.session_state.participants_version,
+                  StratifiedSampler.from_participants(st.session_state.participants))
+        st.session_state.stratified_sampler = cached
+    return cached[1]
+
+def eligibility_rules():
+    """Collect the active eligibility rules from the session settings."""
+    rules = []
+    if st.session_state.get("exclude_past_winners") and st.session_state.past_winners:
+        rules.append(exclude_names(st.session_state.past_winners))
+    if st.session_state.get("excluded_groups"):
+        rules.append(exclude_groups(st.session_state.excluded_groups))
+    if st.session_state.get("min_eligible_tickets", 1) > 1:
+        rules.append(min_tickets(st.session_state.min_eligible_tickets))
+    return rules
+
+def drawing_rng():
+    """Return the random generator selected for drawings."""
+    return get_rng("secure" if st.session_state.secure_rng else "standard")
+
+def set_secure_rng():
+    """Store the secure random toggle in the session settings."""
+    st.session_state.secure_rng = st.session_state.secure_rng_toggle
+
 def add_participant():
     """Add a new participant to the list."""
-    if st.session_state.new_name and st.session_state.new_tickets > 0:
-        # Check for duplicates
-        existing_names = [p["name"].lower() for p in st.session_state.participants]
-        if st.session_state.new_name.lower() in existing_names:
+    if clean_name(st.session_state.new_name) and st.session_state.new_tickets > 0:
+        # Check for duplicates using the same normalization as file imports
+        new_key = normalize_name(st.session_state.new_name)
+        existing_names = [normalize_name(p["name"]) for p in st.session_state.participants]
+        if new_key in existing_names:
             # Update tickets if the name already exists
-            for p in st.session_state.participants:
-                if p["name"].lower() == st.session_state.new_name.lower():
+            for i, p in enumerate(st.session_state.participants):
+                if normalize_name(p["name"]) == new_key:
                     p["tickets"] = st.session_state.new_tickets
+                    participants_changed("update", i)
                     break
         else:
             # Add new participant
             st.session_state.participants.append({
-                "name": st.session_state.new_name,
+                "name": clean_name(st.session_state.new_name),
                 "tickets": st.session_state.new_tickets
             })
+            participants_changed("append")
         
         # Reset input fields
         st.session_state.new_name = ""
@@ -83,31 +195,40 @@ def reset_drawing():
     st.session_state.drawing_in_progress = False
 
 def start_drawing():
-    """Start the drawing animation process."""
+    """Start the drawing animation process; returns whether a drawing started."""
     if not st.session_state.participants:
         st.warning(t("no_participants"))
-        return
+        return False
+    
+    if get_eligibility_index().sampler(eligibility_rules()).total <= 0:
+        st.warning(t("no_eligible_participants"))
+        return False
     
     # Play a drum roll sound when starting the drawing
     play_sound("drum_roll")
     
     st.session_state.drawing_in_progress = True
     st.session_state.winner = None
-    st.rerun()
+    return True
 
 def display_probability_chart():
     """Display a bar chart of winning probabilities."""
     if not st.session_state.participants:
         return
     
-    # Calculate probabilities
-    probs = calculate_probabilities(st.session_state.participants)
-    
-    # Sort by probability in descending order
-    probs = sorted(probs, key=lambda x: x["probability"], reverse=True)
+    # Keep the participants with the most tickets and pool the rest, so the
+    # chart stays readable and cheap for long lists. Shares are computed
+    # from exact ticket totals; only the labels are rounded.
+    participants = sorted(st.session_state.participants, key=lambda p: p["tickets"], reverse=True)
+    total_tickets = ticket_total([p["tickets"] for p in participants])
+    shares = [(p["name"], p["tickets"]) for p in participants[:CHART_TOP_N]]
+    if len(participants) > CHART_TOP_N:
+        shares.append((t("others"), ticket_total([p["tickets"] for p in participants[CHART_TOP_N:]])))
     
     # Create a DataFrame for plotting
-    df = pd.DataFrame(probs)
+    df = pd.DataFrame(shares, columns=["name", "tickets"])
+    df["probability"] = [tickets / total_tickets * 100 if total_tickets else 0.0
+                         for tickets in df["tickets"]]
     
     # Create the figure
     fig, ax = plt.subplots(figsize=(10, 5))
@@ -116,7 +237,7 @@ def display_probability_chart():
     # Add probability values as text
     for bar, prob in zip(bars, df["probability"]):
         ax.text(bar.get_width() + 0.5, bar.get_y() + bar.get_height()/2, 
-                f"{prob:.1f}%", va='center')
+                f"{prob:.3g}%", va='center')
     
     # Add labels and title
     ax.set_xlabel(t("probability"))
@@ -129,84 +250,33 @@ def display_probability_chart():
 
 def download_participants():
     """Generate a CSV download link for current participants."""
-    csv_data = save_to_csv(st.session_state.participants)
-    b64 = base64.b64encode(csv_data.encode()).decode()
+    # The encoded CSV only changes with the participant list
+    cached = st.session_state.get("download_cache")
+    if cached is None or cached[0] != st.session_state.participants_version:
+        csv_data = save_to_csv(st.session_state.participants)
+        cached = (st.session_state.participants_version, base64.b64encode(csv_data.encode()).decode())
+        st.session_state.download_cache = cached
+    b64 = cached[1]
     href = f'<a href="data:file/csv;base64,{b64}" download="participants.csv">{t("save")}</a>'
     return href
 
+def draw_group_winners(quotas):
+    """Draw the winners of every group in one stratified pass."""
+    sampler = get_stratified_sampler()
+    mask = get_eligibility_index().mask(eligibility_rules())
+    drawn = sampler.draw(quotas, drawing_rng(), mask)
+    st.session_state.group_winners = [
+        {"group": group, "name": st.session_state.participants[i]["name"],
+         "tickets": st.session_state.participants[i]["tickets"]}
+        for group, indices in drawn.items()
+        for i in indices
+    ]
+    st.session_state.past_winners.extend(w["name"] for w in st.session_state.group_winners)
+
 def toggle_statistics():
     """Toggle display of statistics charts."""
     st.session_state.show_stats = not st.session_state.show_stats
 
-# Main app layout
-st.title(t("app_title"))
-
-# Language selection
-with st.sidebar:
-    # Language selector
-    selected_language = st.selectbox(
-        t("language"),
-        options=get_available_languages(),
-        index=get_available_languages().index(st.session_state.language)
-    )
-    
-    if selected_language != st.session_state.language:
-        st.session_state.language = selected_language
-        st.rerun()
-    
-    # Custom drawing title
-    custom_title = st.text_input(
-        t("custom_title"), 
-        value=st.session_state.drawing_title
-    )
-    
-    if custom_title != st.session_state.drawing_title:
-        st.session_state.drawing_title = custom_title
-
-    # Upload participants from CSV
-    st.subheader(t("load"))
-    uploaded_file = st.file_uploader(t("upload_file"), type=["csv"])
-    
-    if uploaded_file is not None:
-        csv_content = uploaded_file.getvalue().decode("utf-8")
-        loaded_participants = load_from_csv(csv_content)
-        
-        if loaded_participants:
-            st.session_state.participants = loaded_participants
-            st.success(t("file_loaded"))
-            st.rerun()
-        else:
-            st.error(t("invalid_file"))
-    
-    # Download participants to CSV
-    if st.session_state.participants:
-        st.markdown(download_participants(), unsafe_allow_html=True)
-
-# Main drawing section
-st.header(st.session_state.drawing_title)
-
-# Participant entry form
-with st.form(key="add_participant_form"):
-    col1, col2 = st.columns([3, 1])
-    
-    with col1:
-        st.text_input(t("name_label"), key="new_name")
-    
-    with col2:
-        st.number_input(
-            t("tickets_label"), 
-            min_value=1, 
-            max_value=1000, 
-            value=1,
-            step=1,
-            key="new_tickets"
-        )
-    
-    submit_button = st.form_submit_button(
-        label=t("add_participant"), 
-        on_click=add_participant
-    )
-
 # Function to edit participants
 def edit_participant(i):
     """Edit a participant in the list."""
@@ -214,16 +284,33 @@ def edit_participant(i):
     # Pre-fill form with current values
     participant = st.session_state.participants[i]
     st.session_state.edit_name = participant["name"]
-    st.session_state.edit_tickets = participant["tickets"]
+    # Imported counts can exceed what the form can represent; those are
+    # shown clamped but not editable, and save_edit keeps the stored count
+    st.session_state.edit_tickets = min(participant["tickets"], MAX_FORM_TICKETS)
 
 def save_edit():
     """Save edits to a participant."""
-    if st.session_state.edit_index is not None and st.session_state.edit_name and st.session_state.edit_tickets > 0:
-        # Update participant
+    name = clean_name(st.session_state.edit_name)
+    if st.session_state.edit_index is not None and name and st.session_state.edit_tickets > 0:
+        # Reject names that would duplicate another participant, as imports do
+        key = normalize_name(name)
+        if any(normalize_name(p["name"]) == key
+               for i, p in enumerate(st.session_state.participants)
+               if i != st.session_state.edit_index):
+            st.warning(t("duplicate_name"))
+            return
+        
+        # Update participant, keeping attributes the form doesn't edit
+        participant = st.session_state.participants[st.session_state.edit_index]
+        tickets = participant["tickets"]
+        if tickets <= MAX_FORM_TICKETS:
+            tickets = st.session_state.edit_tickets
         st.session_state.participants[st.session_state.edit_index] = {
-            "name": st.session_state.edit_name,
-            "tickets": st.session_state.edit_tickets
+            **participant,
+            "name": name,
+            "tickets": tickets
         }
+        participants_changed("update", st.session_state.edit_index)
         # Reset edit state
         st.session_state.edit_index = None
         st.rerun()
@@ -232,6 +319,7 @@ def delete_participant(i):
     """Delete a participant from the list."""
     if i < len(st.session_state.participants):
         st.session_state.participants.pop(i)
+        participants_changed("delete", i)
         st.rerun()
 
 # Initialize edit states if not already present
@@ -242,8 +330,73 @@ if 'edit_name' not in st.session_state:
 if 'edit_tickets' not in st.session_state:
     st.session_state.edit_tickets = 1
 
-# Display participants table
-if st.session_state.participants:
+# Page sections. Each fragment reruns on its own when one of its widgets is
+# used. Anything that changes the participant list calls st.rerun() so every
+# section that reads the list is refreshed; other interactions stay local.
+
+@st.fragment
+def title_section():
+    """Drawing title and its editor; depends only on drawing_title."""
+    col1, col2 = st.columns([10, 1], vertical_alignment="center")
+    with col1:
+        st.header(st.session_state.drawing_title)
+    with col2:
+        with st.popover("✏️"):
+            st.text_input(t("custom_title"), key="drawing_title")
+
+@st.fragment
+def upload_section():
+    """CSV import; replaces the participant list."""
+    st.subheader(t("load"))
+    st.selectbox(
+        t("merge_policy"),
+        options=MERGE_POLICIES,
+        format_func=lambda policy: t(f"merge_{policy}"),
+        key="merge_policy"
+    )
+    uploaded_file = st.file_uploader(t("upload_file"), type=["csv", "parquet"])
+    
+    # Only import each uploaded file once; the uploader keeps it across reruns
+    if uploaded_file is not None and uploaded_file.file_id != st.session_state.get("loaded_file_id"):
+        if uploaded_file.name.lower().endswith(".parquet"):
+            loaded_participants, merge_report = load_from_parquet(
+                uploaded_file.getvalue(), st.session_state.merge_policy, with_report=True
+            )
+        else:
+            csv_content = uploaded_file.getvalue().decode("utf-8")
+            loaded_participants, merge_report = load_from_csv(
+                csv_content, st.session_state.merge_policy, with_report=True
+            )
+        
+        if loaded_participants:
+            st.session_state.participants = loaded_participants
+            participants_changed()
+            st.session_state.merge_report = merge_report
+            st.session_state.group_winners = None
+            st.session_state.loaded_file_id = uploaded_file.file_id
+            st.success(t("file_loaded"))
+            st.rerun()
+        else:
+            st.error(t("invalid_file"))
+    
+    # Summarize duplicates merged during the last import
+    report = st.session_state.merge_report
+    if report and (report["rows_merged"] or report["rows_dropped"]):
+        st.info(
+            f"{t('merge_report')}: {report['rows_in']} → {report['participants_out']} "
+            f"({report['rows_merged']} {t('rows_merged')}, "
+            f"{report['rows_dropped']} {t('rows_dropped')})"
+        )
+        if report["merged_names"]:
+            with st.expander(t("merged_names")):
+                st.dataframe(pd.DataFrame(report["merged_names"]))
+
+@st.fragment
+def participants_section():
+    """Participant table, edit/delete controls and eligibility rules."""
+    if not st.session_state.participants:
+        return
+    
     st.subheader(t("participants"))
     
     # Convert to DataFrame for display
@@ -251,9 +404,9 @@ if st.session_state.participants:
     
     # Calculate probability column if we have participants
     if not df.empty:
-        total_tickets = df["tickets"].sum()
-        df["probability"] = (df["tickets"] / total_tickets * 100).round(2)
-        df["probability"] = df["probability"].astype(str) + "%"
+        total_tickets = ticket_total(df["tickets"].to_numpy())
+        probability = df["tickets"] / total_tickets * 100 if total_tickets else df["tickets"] * 0.0
+        df["probability"] = probability.map("{:.4g}%".format)
     
     # Add action column for edit and delete buttons
     df["actions"] = None
@@ -262,6 +415,7 @@ if st.session_state.participants:
     df = df.rename(columns={
         "name": t("name_label"),
         "tickets": t("tickets_label"),
+        "group": t("group_label"),
         "probability": t("probability"),
         "actions": ""  # Empty string for actions column header
     })
@@ -292,14 +446,19 @@ if st.session_state.participants:
     if st.session_state.edit_index is not None:
         st.subheader(t("edit_participant"))
         
+        tickets_locked = st.session_state.participants[st.session_state.edit_index]["tickets"] > MAX_FORM_TICKETS
+        if tickets_locked:
+            st.warning(t("tickets_too_large_to_edit"))
+        
         with st.form(key="edit_participant_form"):
             st.text_input(t("name_label"), key="edit_name")
             st.number_input(
                 t("tickets_label"), 
                 min_value=1, 
-                max_value=1000, 
+                max_value=MAX_FORM_TICKETS, 
                 step=1,
-                key="edit_tickets"
+                key="edit_tickets",
+                disabled=tickets_locked
             )
             
             col1, col2 = st.columns(2)
@@ -312,86 +471,280 @@ if st.session_state.participants:
                 cancel = st.form_submit_button(t("cancel"))
                 if cancel:
                     st.session_state.edit_index = None
-                    st.rerun()
+                    st.rerun(scope="fragment")
+    
+    # Eligibility rules, applied to the next drawing
+    with st.expander(t("eligibility"), expanded=False):
+        st.checkbox(t("exclude_past_winners"), key="exclude_past_winners")
+        group_options = sorted(group_participants(st.session_state.participants))
+        if group_options:
+            st.multiselect(t("excluded_groups"), options=group_options, key="excluded_groups")
+        st.number_input(t("min_eligible_tickets"), min_value=1, value=1, step=1,
+                        key="min_eligible_tickets")
+        
+        eligible = get_eligibility_index().mask(eligibility_rules())
+        st.caption(f"{t('eligible_participants')}: {int(eligible.sum())} / {len(eligible)}")
+    
+    if st.button(t("reset"), key="reset_button"):
+        st.session_state.participants = []
+        st.session_state.past_winners = []
+        participants_changed()
+        reset_drawing()
+        st.rerun()
+    
+    # Display total tickets
+    total_tickets = ticket_total([p["tickets"] for p in st.session_state.participants])
+    st.info(f"{t('total_tickets')}: {total_tickets:,}")
+
+@st.fragment
+def statistics_section():
+    """Probability chart; depends on the participant list and show_stats."""
+    if not st.session_state.participants:
+        return
     
-    # Action buttons
-    col1, col2, col3 = st.columns(3)
+    st.button(
+        t("hide_statistics") if st.session_state.show_stats else t("show_statistics"),
+        on_click=toggle_statistics,
+        key="statistics_button"
+    )
     
-    with col1:
-        if st.button(t("draw_button"), key="draw_button"):
-            start_drawing()
+    if st.session_state.show_stats:
+        chart = display_probability_chart()
+        if chart:
+            st.pyplot(chart)
+            plt.close(chart)
+
+@st.fragment
+def group_drawing_section():
+    """Stratified drawing with a fixed number of winners per group."""
+    group_counts = group_participants(st.session_state.participants)
+    if not group_counts:
+        return
     
-    with col2:
-        if st.button(t("reset"), key="reset_button"):
-            st.session_state.participants = []
-            reset_drawing()
+    with st.expander(t("group_drawing"), expanded=False):
+        quota_table = st.data_editor(
+            pd.DataFrame({
+                "group": list(group_counts),
+                "participants": list(group_counts.values()),
+                "quota": 1
+            }),
+            column_config={
+                "group": st.column_config.TextColumn(t("group_label"), disabled=True),
+                "participants": st.column_config.NumberColumn(t("participants"), disabled=True),
+                "quota": st.column_config.NumberColumn(t("quota"), min_value=0, step=1)
+            },
+            hide_index=True,
+            key="group_quotas"
+        )
+        
+        if st.button(t("draw_groups_button"), key="draw_groups_button"):
+            draw_group_winners(dict(zip(quota_table["group"], quota_table["quota"].fillna(0).astype(int))))
+            # Past winners feed the eligibility rules, so refresh the whole page
             st.rerun()
+        
+        if st.session_state.group_winners:
+            st.dataframe(pd.DataFrame(st.session_state.group_winners).rename(columns={
+                "group": t("group_label"),
+                "name": t("name_label"),
+                "tickets": t("tickets_label")
+            }), hide_index=True)
+
+@st.fragment
+def verification_section():
+    """Commit/reveal drawing against a published digest of the participant list."""
+    if not st.session_state.participants:
+        return
     
-    with col3:
-        if st.session_state.show_stats:
-            if st.button(t("hide_statistics")):
-                toggle_statistics()
-        else:
-            if st.button(t("show_statistics")):
-                toggle_statistics()
+    with st.expander(t("verifiable_drawing"), expanded=False):
+        commitment = st.session_state.draw_commitment
+        if commitment is None:
+            st.caption(t("verifiable_drawing_help"))
+            if st.button(t("publish_commitment"), key="commit_button"):
+                digest = get_participant_digest()
+                commitment, seed = commit_draw(digest)
+                st.session_state.draw_commitment = commitment
+                st.session_state.draw_seed = seed
+                st.session_state.draw_records = []
+                st.session_state.draw_snapshot = json.dumps(
+                    digest.snapshot(st.session_state.participants), ensure_ascii=False
+                )
+                st.rerun(scope="fragment")
+            return
+        
+        st.json(commitment)
+        st.download_button(
+            t("download_participant_snapshot"),
+            data=st.session_state.draw_snapshot,
+            file_name="participants_snapshot.json",
+            mime="application/json"
+        )
+        
+        # The committed tree covers every ticket, so a committed draw cannot
+        # honour exclusions; draw only while no eligibility rule is active
+        rules_active = bool(eligibility_rules())
+        if rules_active:
+            st.caption(t("verifiable_rules_active"))
+        if st.button(t("draw_committed_button"), key="draw_committed_button", disabled=rules_active):
+            record = draw_committed(
+                get_participant_digest(), st.session_state.participants, commitment,
+                st.session_state.draw_seed, draw=len(st.session_state.draw_records)
+            )
+            st.session_state.draw_records.append(record)
+            st.session_state.winner = record["winner"]
+            st.session_state.past_winners.append(record["winner"]["name"])
+            st.session_state.celebration_played = False
+            # The winner display and eligibility rules live in other sections
+            st.rerun()
+        
+        records = st.session_state.draw_records
+        if records:
+            st.dataframe(pd.DataFrame([
+                {"draw": r["draw"] + 1, t("name_label"): r["winner"]["name"],
+                 "ticket": r["ticket"], t("verified"): "✅" if verify_draw(r) else "❌"}
+                for r in records
+            ]), hide_index=True)
+            st.download_button(
+                t("download_draw_records"),
+                data=json.dumps(records, ensure_ascii=False, indent=2),
+                file_name="draw_records.json",
+                mime="application/json"
+            )
+
+@st.fragment
+def drawing_section():
+    """Draw button, drawing animation and winner display."""
+    if st.session_state.participants:
+        col1, col2 = st.columns([1, 3], vertical_alignment="center")
+        # The toggle is rendered first, and stays rendered while drawing
+        with col2:
+            st.toggle(t("secure_rng"), value=st.session_state.secure_rng, key="secure_rng_toggle",
+                      on_change=set_secure_rng, help=t("secure_rng_help"),
+                      disabled=st.session_state.drawing_in_progress)
+        if not st.session_state.drawing_in_progress:
+            with col1:
+                if st.button(t("draw_button"), key="draw_button") and start_drawing():
+                    st.rerun(scope="fragment")
     
-    # Display total tickets
-    total_tickets = sum(p["tickets"] for p in st.session_state.participants)
-    st.info(f"{t('total_tickets')}: {total_tickets}")
-
-# Statistics visualization
-if st.session_state.show_stats and st.session_state.participants:
-    chart = display_probability_chart()
-    if chart:
-        st.pyplot(chart)
-
-# Drawing animation and results
-if st.session_state.drawing_in_progress:
-    # Display progress message
-    st.subheader(t("drawing_in_progress"))
-    
-    # Perform drawing animation
-    with st.spinner():
-        winner = draw_animation(st.session_state.participants)
-        st.session_state.winner = winner
-        st.session_state.drawing_in_progress = False
+    # Drawing animation and results
+    if st.session_state.drawing_in_progress:
+        # Display progress message
+        st.subheader(t("drawing_in_progress"))
+        
+        # Perform drawing animation
+        with st.spinner():
+            sampler = get_eligibility_index().sampler(eligibility_rules())
+            winner = draw_animation(st.session_state.participants, sampler=sampler, rng=drawing_rng())
+            st.session_state.winner = winner
+            st.session_state.past_winners.append(winner["name"])
+            st.session_state.celebration_played = False
+            st.session_state.drawing_in_progress = False
+            # Past winners feed the eligibility rules, so refresh the whole page
+            st.rerun()
+    
+    # Display winner
+    if st.session_state.winner:
+        st.subheader(t("winner"))
+        
+        # Play the celebration sound once per winner rather than on every rerun
+        if not st.session_state.celebration_played:
+            play_sound("celebration")
+            st.session_state.celebration_played = True
+        
+        # Celebration and winner box are animated in the browser
+        celebration_animation(
+            st.session_state.winner["name"],
+            st.session_state.language,
+            f'{t("tickets_label")}: {st.session_state.winner["tickets"]:,}'
+        )
+        
+        if st.button(t("draw_button") + " ↺") and start_drawing():
+            st.rerun(scope="fragment")
+
+# Main app layout
+st.title(t("app_title"))
+
+with st.sidebar:
+    # Language selector; every section is translated, so switching reruns the app
+    selected_language = st.selectbox(
+        t("language"),
+        options=get_available_languages(),
+        index=get_available_languages().index(st.session_state.language)
+    )
+    
+    if selected_language != st.session_state.language:
+        st.session_state.language = selected_language
         st.rerun()
+    
+    upload_section()
+    
+    # Download participants to CSV
+    if st.session_state.participants:
+        st.markdown(download_participants(), unsafe_allow_html=True)
 
-# Display winner
-if st.session_state.winner:
-    st.subheader(t("winner"))
-    
-    # Play celebration sound
-    play_sound("celebration")
-    
-    # Display celebration
-    celebration_animation(st.session_state.winner["name"], st.session_state.language)
-    
-    # Winner details
-    with st.container():
-        st.markdown("""
-        <style>
-        .winner-box {
-            padding: 20px;
-            border-radius: 10px;
-            text-align: center;
-            margin: 20px 0;
-            animation: winner-pulse 2s infinite;
-        }
-        @keyframes winner-pulse {
-            0% { box-shadow: 0 0 0 0px rgba(255, 215, 0, 0.4); }
-            100% { box-shadow: 0 0 0 20px rgba(255, 215, 0, 0); }
-        }
-        </style>
-        """, unsafe_allow_html=True)
+# Main drawing section
+title_section()
+
+# Participant entry form
+with st.form(key="add_participant_form"):
+    col1, col2 = st.columns([3, 1])
+    
+    with col1:
+        st.text_input(t("name_label"), key="new_name")
+    
+    with col2:
+        st.number_input(
+            t("tickets_label"), 
+            min_value=1, 
+            max_value=MAX_FORM_TICKETS, 
+            value=1,
+            step=1,
+            key="new_tickets"
+        )
+    
+    submit_button = st.form_submit_button(
+        label=t("add_participant"), 
+        on_click=add_participant
+    )
+
+participants_section()
+statistics_section()
+group_drawing_section()
+verification_section()
+drawing_section()
+
+
+# Memory debug panel, shown with ?debug=1 only when the server sets PRIZE_DRAW_DEBUG
+if os.environ.get("PRIZE_DRAW_DEBUG") and st.query_params.get("debug") == "1":
+    ctx = get_script_run_ctx()
+    if profiler.enabled:
+        profiler.record()
+        profiler.record_session(ctx.session_id if ctx else "unknown", st.session_state)
+    
+    with st.sidebar.expander(t("memory_debug"), expanded=False):
+        if st.toggle(t("memory_profiling"), value=profiler.enabled, key="memory_profiling") != profiler.enabled:
+            if profiler.enabled:
+                profiler.stop()
+            else:
+                profiler.start()
+            st.rerun()
         
-        winner_html = f"""
-        <div class="winner-box">
-            <h1>🏆 {st.session_state.winner["name"]} 🏆</h1>
-            <h3>{t("tickets_label")}: {st.session_state.winner["tickets"]}</h3>
-        </div>
-        """
-        st.markdown(winner_html, unsafe_allow_html=True)
+        report = profiler.report()
+        if not report["tracing"]:
+            # Sizes are cheap to estimate even without allocation tracing
+            report["sessions"] = {"current": {"keys": session_state_sizes(st.session_state)}}
+            report["module_caches"] = module_cache_sizes()
         
-        if st.button(t("draw_button") + " ↺"):
-            start_drawing()
+        if report["reruns"]:
+            last = report["reruns"][-1]
+            st.metric(t("traced_memory"), f"{last['traced'] / 1e6:.1f} MB",
+                      f"{(last['traced'] - report['reruns'][0]['traced']) / 1e6:+.1f} MB")
+        if report["growth_since_last_rerun"]:
+            st.dataframe(pd.DataFrame(report["growth_since_last_rerun"]), hide_index=True)
+        st.json(report["module_caches"])
+        
+        st.download_button(
+            t("download_memory_report"),
+            data=json.dumps(report, default=str, indent=2),
+            file_name="memory_report.json",
+            mime="application/json"
+        )
@@ -0,0 +1,122 @@
+"""
+Headless batch drawing for the prize drawing application.
+
+Runs many drawings from a participants CSV without starting Streamlit:
+
+    python draw_cli.py participants.csv --draws 500 --seed 42 --output winners.jsonl
+
+Participants can also be read from a .parquet file (requires pyarrow).
+Winners are written as JSON lines, or as CSV when the output file ends
+in .csv. Only pandas and NumPy are imported, and all draws are taken in
+one vectorized batch.
+"""
+import argparse
+import json
+import sys
+
+import pandas as pd
+
+from rng import get_rng
+from sampler import TicketSampler
+from utils import calculate_probabilities, read_participants, MERGE_POLICIES
+
+def positive_int(value):
+    """Argparse type for counts that must be at least 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+def parse_args(argv=None):
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Draw prize winners from a participants CSV.")
+    parser.add_argument("participants",
+                        help="CSV or Parquet file with name and tickets columns ('-' for CSV on stdin)")
+    parser.add_argument("-n", "--draws", type=positive_int, default=1, help="number of winners to draw")
+    parser.add_argument("--seed", type=int, default=None, help="random seed for reproducible draws")
+    parser.add_argument("--secure", action="store_true",
+                        help="draw with buffered OS entropy (cannot be combined with --seed)")
+    parser.add_argument("-o", "--output", default="-", help="output file ('-' for stdout)")
+    parser.add_argument("--format", choices=("jsonl", "csv"), default=None,
+                        help="output format (default: from the output file extension)")
+    parser.add_argument("--with-replacement", action="store_true",
+                        help="allow the same participant to win more than once")
+    parser.add_argument("--merge-policy", choices=MERGE_POLICIES, default="sum",
+                        help="how to combine tickets of duplicate names")
+    return parser.parse_args(argv)
+
+def draw_winners(df, draws, rng, with_replacement=False):
+    """
+    Draw winners from a participants DataFrame.
+
+    Args:
+        df: DataFrame with name and tickets columns
+        draws: Number of winners to draw
+        rng: Random generator from rng.get_rng
+        with_replacement: Allow the same participant to win more than once
+
+    Returns:
+        List of winner dictionaries with draw number and probability
+    """
+    sampler = TicketSampler(df["tickets"].to_numpy())
+    if with_replacement:
+        indices = sampler.draw(rng, size=draws)
+    else:
+        indices = sampler.draw_unique(rng, draws)
+
+    winners = df.iloc[indices].to_dict("records")
+    probabilities = calculate_probabilities(winners, total_tickets=sampler.total, decimals=8)
+    return [
+        {"draw": number, **winner, "probability": probability["probability"]}
+        for number, (winner, probability) in enumerate(zip(winners, probabilities), start=1)
+    ]
+
+def write_winners(winners, output, fmt):
+    """Write winners to a file or stdout as JSON lines or CSV."""
+    stream = sys.stdout if output == "-" else open(output, "w", encoding="utf-8", newline="")
+    try:
+        if fmt == "csv":
+            pd.DataFrame(winners).to_csv(stream, index=False)
+        else:
+            stream.writelines(json.dumps(winner, ensure_ascii=False) + "\n" for winner in winners)
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+
+def main(argv=None):
+    args = parse_args(argv)
+    fmt = args.format or ("csv" if args.output.endswith(".csv") else "jsonl")
+
+    source = sys.stdin if args.participants == "-" else args.participants
+    file_format = "parquet" if args.participants.lower().endswith(".parquet") else "csv"
+    try:
+        df, report = read_participants(source, args.merge_policy, file_format)
+    except (OSError, ValueError, ImportError) as error:
+        print(f"error: {error}", file=sys.stderr)
+        return 1
+    if df is None:
+        print("error: participants file needs name and tickets columns", file=sys.stderr)
+        return 1
+    if report["rows_merged"]:
+        print(f"merged {report['rows_merged']} duplicate rows "
+              f"({report['rows_in']} -> {report['participants_out']} participants)", file=sys.stderr)
+
+    try:
+        rng = get_rng("secure" if args.secure else "standard", args.seed)
+        winners = draw_winners(df, args.draws, rng, args.with_replacement)
+    except ValueError as error:
+        print(f"error: {error}", file=sys.stderr)
+        return 1
+
+    if len(winners) < args.draws:
+        print(f"only {len(winners)} participants have tickets; drew {len(winners)} winners",
+              file=sys.stderr)
+    try:
+        write_winners(winners, args.output, fmt)
+    except OSError as error:
+        print(f"error: {error}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
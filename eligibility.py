@@ -0,0 +1,107 @@
+"""
+Eligibility rules for the prize drawing application.
+
+Rules are small hashable tuples over participant attributes. An
+EligibilityIndex compiles group and ticket rules into boolean NumPy masks
+once and caches them, so toggling rules between draws only combines cached
+masks instead of rebuilding the participant list. Name exclusions are
+looked up by position and never cached.
+"""
+import numpy as np
+
+from sampler import TicketSampler
+from utils import normalize_name
+
+def exclude_names(names):
+    """Rule excluding participants by name, e.g. previous winners."""
+    return ("exclude_names", frozenset(normalize_name(name) for name in names))
+
+def exclude_groups(groups):
+    """Rule excluding whole groups."""
+    return ("exclude_groups", frozenset(groups))
+
+def min_tickets(count):
+    """Rule excluding participants holding fewer than count tickets."""
+    return ("min_tickets", int(count))
+
+# Number of rule masks and samplers kept per participant list
+RULE_CACHE_LIMIT = 8
+
+class EligibilityIndex:
+    """
+    Cached eligibility masks and samplers for one participant list.
+
+    Only group and ticket rules are cached. The excluded names change after
+    every draw, so they are applied to a copy of the cached mask or tickets
+    by position instead of adding a cache entry per draw.
+    """
+
+    def __init__(self, participants):
+        self.tickets = np.array([p["tickets"] for p in participants], dtype=np.int64)
+        self.name_keys = np.array([normalize_name(p["name"]) for p in participants], dtype=object)
+        self.groups = np.array([p.get("group") or "" for p in participants], dtype=object)
+        self.positions = {}
+        for index, key in enumerate(self.name_keys):
+            self.positions.setdefault(key, []).append(index)
+        self._masks = {}
+        self._samplers = {}
+        self._current = None
+
+    def excluded_positions(self, rules):
+        """Indices of participants excluded by the name rules."""
+        return [
+            index
+            for kind, value in rules if kind == "exclude_names"
+            for name in value
+            for index in self.positions.get(name, ())
+        ]
+
+    def rule_mask(self, rule):
+        """Return the cached mask of participants allowed by a group or ticket rule."""
+        if rule not in self._masks:
+            kind, value = rule
+            if kind == "exclude_groups":
+                mask = ~np.isin(self.groups, list(value))
+            elif kind == "min_tickets":
+                mask = self.tickets >= value
+            else:
+                raise ValueError(f"Unknown eligibility rule: {kind}")
+            if len(self._masks) >= RULE_CACHE_LIMIT:
+                self._masks.pop(next(iter(self._masks)))
+            self._masks[rule] = mask
+        return self._masks[rule]
+
+    def mask(self, rules):
+        """Combine the masks of all rules; every participant is eligible without rules."""
+        mask = np.ones(len(self.tickets), dtype=bool)
+        for rule in rules:
+            if rule[0] != "exclude_names":
+                mask &= self.rule_mask(rule)
+        mask[self.excluded_positions(rules)] = False
+        return mask
+
+    def sampler(self, rules):
+        """
+        Return a sampler restricted to eligible participants.
+
+        Ineligible participants keep their position with zero tickets, so
+        drawn indices still refer to the original participant list.
+        """
+        key = frozenset(rules)
+        if self._current is not None and self._current[0] == key:
+            return self._current[1]
+
+        static = frozenset(rule for rule in rules if rule[0] != "exclude_names")
+        if static not in self._samplers:
+            if len(self._samplers) >= RULE_CACHE_LIMIT:
+                self._samplers.pop(next(iter(self._samplers)))
+            self._samplers[static] = TicketSampler(np.where(self.mask(static), self.tickets, 0))
+        sampler = self._samplers[static]
+
+        excluded = self.excluded_positions(rules)
+        if excluded:
+            tickets = sampler.tickets.copy()
+            tickets[excluded] = 0
+            sampler = TicketSampler(tickets)
+        self._current = (key, sampler)
+        return sampler
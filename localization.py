@@ -33,7 +33,42 @@ TRANSLATIONS = {
         "show_statistics": "Show Statistics",
         "hide_statistics": "Hide Statistics",
         "total_tickets": "Total Tickets",
-        "drawing_title": "Prize Drawing"
+        "drawing_title": "Prize Drawing",
+        "merge_policy": "Duplicate names on import",
+        "merge_sum": "Add up tickets",
+        "merge_max": "Keep highest ticket count",
+        "merge_last": "Keep last row",
+        "merge_report": "Duplicates merged",
+        "rows_merged": "rows merged",
+        "rows_dropped": "rows without a name skipped",
+        "duplicate_name": "Another participant already has this name",
+        "merged_names": "Merged names",
+        "group_label": "Group",
+        "group_drawing": "Drawing by Group",
+        "quota": "Winners",
+        "draw_groups_button": "Draw All Groups",
+        "eligibility": "Eligibility",
+        "exclude_past_winners": "Exclude previous winners",
+        "excluded_groups": "Excluded groups",
+        "min_eligible_tickets": "Minimum tickets to be eligible",
+        "eligible_participants": "Eligible participants",
+        "no_eligible_participants": "No eligible participants with tickets",
+        "memory_debug": "Memory Debug",
+        "memory_profiling": "Trace allocations",
+        "traced_memory": "Traced memory",
+        "download_memory_report": "Download memory report",
+        "secure_rng": "Secure random numbers",
+        "secure_rng_help": "Draw with operating system entropy, for regulated sweepstakes",
+        "verifiable_drawing": "Verifiable Drawing",
+        "verifiable_drawing_help": "Publish a commitment to the participant list and a secret seed before drawing; the seed is revealed with each result so anyone can replay it.",
+        "publish_commitment": "Publish Commitment",
+        "download_participant_snapshot": "Download participant snapshot",
+        "draw_committed_button": "Draw and Reveal",
+        "verifiable_rules_active": "Verifiable draws use every ticket in the committed list; turn off the eligibility rules to draw.",
+        "tickets_too_large_to_edit": "This ticket count is too large to edit in the browser; it is kept as imported.",
+        "verified": "Verified",
+        "download_draw_records": "Download draw records",
+        "others": "Others"
     },
     "中文": {
         "app_title": "抽獎應用",
@@ -65,7 +100,42 @@ TRANSLATIONS = {
         "show_statistics": "顯示統計信息",
         "hide_statistics": "隱藏統計信息",
         "total_tickets": "總票數",
-        "drawing_title": "抽獎"
+        "drawing_title": "抽獎",
+        "merge_policy": "匯入時的重複姓名",
+        "merge_sum": "合計抽獎券",
+        "merge_max": "保留最高抽獎券數",
+        "merge_last": "保留最後一行",
+        "merge_report": "已合併重複項",
+        "rows_merged": "行已合併",
+        "rows_dropped": "行因缺少姓名而略過",
+        "duplicate_name": "已有其他參與者使用此名稱",
+        "merged_names": "已合併的姓名",
+        "group_label": "組別",
+        "group_drawing": "分組抽獎",
+        "quota": "得獎名額",
+        "draw_groups_button": "抽出所有組別",
+        "eligibility": "抽獎資格",
+        "exclude_past_winners": "排除先前的得獎者",
+        "excluded_groups": "排除的組別",
+        "min_eligible_tickets": "具資格的最低抽獎券數",
+        "eligible_participants": "具資格的參與者",
+        "no_eligible_participants": "沒有具資格且持有抽獎券的參與者",
+        "memory_debug": "記憶體除錯",
+        "memory_profiling": "追蹤記憶體配置",
+        "traced_memory": "已追蹤記憶體",
+        "download_memory_report": "下載記憶體報告",
+        "secure_rng": "安全亂數",
+        "secure_rng_help": "使用作業系統熵源抽獎，適用於受監管的抽獎活動",
+        "verifiable_drawing": "可驗證抽獎",
+        "verifiable_drawing_help": "抽獎前公布參與者名單與秘密種子的承諾；每次結果都會揭露種子，任何人都能重現驗證。",
+        "publish_commitment": "公布承諾",
+        "download_participant_snapshot": "下載參與者快照",
+        "draw_committed_button": "抽獎並揭露",
+        "verifiable_rules_active": "可驗證抽獎使用承諾名單中的所有獎券；請關閉資格規則後再抽獎。",
+        "tickets_too_large_to_edit": "此獎券數量過大，無法在瀏覽器中編輯；將保留匯入時的數值。",
+        "verified": "已驗證",
+        "download_draw_records": "下載抽獎紀錄",
+        "others": "其他"
     },
     "Español": {
         "app_title": "Aplicación de Sorteo",
@@ -97,7 +167,42 @@ TRANSLATIONS = {
         "show_statistics": "Mostrar Estadísticas",
         "hide_statistics": "Ocultar Estadísticas",
         "total_tickets": "Total de Boletos",
-        "drawing_title": "Sorteo de Premios"
+        "drawing_title": "Sorteo de Premios",
+        "merge_policy": "Nombres duplicados al importar",
+        "merge_sum": "Sumar boletos",
+        "merge_max": "Conservar el mayor número de boletos",
+        "merge_last": "Conservar la última fila",
+        "merge_report": "Duplicados combinados",
+        "rows_merged": "filas combinadas",
+        "rows_dropped": "filas sin nombre omitidas",
+        "duplicate_name": "Otro participante ya tiene este nombre",
+        "merged_names": "Nombres combinados",
+        "group_label": "Grupo",
+        "group_drawing": "Sorteo por Grupo",
+        "quota": "Ganadores",
+        "draw_groups_button": "Sortear Todos los Grupos",
+        "eligibility": "Elegibilidad",
+        "exclude_past_winners": "Excluir ganadores anteriores",
+        "excluded_groups": "Grupos excluidos",
+        "min_eligible_tickets": "Boletos mínimos para participar",
+        "eligible_participants": "Participantes elegibles",
+        "no_eligible_participants": "No hay participantes elegibles con boletos",
+        "memory_debug": "Depuración de Memoria",
+        "memory_profiling": "Rastrear asignaciones",
+        "traced_memory": "Memoria rastreada",
+        "download_memory_report": "Descargar informe de memoria",
+        "secure_rng": "Números aleatorios seguros",
+        "secure_rng_help": "Sortear con entropía del sistema operativo, para sorteos regulados",
+        "verifiable_drawing": "Sorteo Verificable",
+        "verifiable_drawing_help": "Publica un compromiso con la lista de participantes y una semilla secreta antes del sorteo; la semilla se revela con cada resultado para que cualquiera pueda reproducirlo.",
+        "publish_commitment": "Publicar Compromiso",
+        "download_participant_snapshot": "Descargar instantánea de participantes",
+        "draw_committed_button": "Sortear y Revelar",
+        "verifiable_rules_active": "Los sorteos verificables usan todos los boletos de la lista comprometida; desactiva las reglas de elegibilidad para sortear.",
+        "tickets_too_large_to_edit": "Este número de boletos es demasiado grande para editarlo en el navegador; se conserva el valor importado.",
+        "verified": "Verificado",
+        "download_draw_records": "Descargar registros del sorteo",
+        "others": "Otros"
     }
 }
 
@@ -0,0 +1,150 @@
+"""
+Memory instrumentation for the prize drawing application.
+
+The profiler diffs tracemalloc snapshots between reruns, estimates how much
+memory each session's state holds and reports the size of module-level
+caches. Everything is collected into a plain dictionary so it can be shown
+in the debug panel or dumped to JSON.
+"""
+import collections
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+# Number of sessions whose footprint is remembered
+SESSION_REGISTRY_LIMIT = 100
+
+def deep_sizeof(obj, seen=None):
+    """
+    Estimate the memory held by an object and everything it references.
+
+    Containers are followed recursively; NumPy arrays and DataFrames report
+    their buffer sizes. Shared objects are only counted once.
+    """
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    if isinstance(obj, np.ndarray):
+        return sys.getsizeof(obj) + (obj.nbytes if obj.base is None else 0)
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        usage = obj.memory_usage(deep=True)
+        return int(usage.sum() if isinstance(usage, pd.Series) else usage)
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset, collections.deque)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    elif hasattr(obj, "__dict__"):
+        size += deep_sizeof(vars(obj), seen)
+    return size
+
+def session_state_sizes(session_state):
+    """Estimate the size of each session state entry, largest first."""
+    seen = set()
+    sizes = {str(key): deep_sizeof(session_state[key], seen) for key in list(session_state.keys())}
+    return dict(sorted(sizes.items(), key=lambda item: item[1], reverse=True))
+
+def module_cache_sizes():
+    """Report the size of module-level caches that live for the whole process."""
+    caches = {}
+
+    sounds = sys.modules.get("sounds")
+    if sounds is not None:
+        caches["sounds.sound_cache"] = {
+            "entries": len(sounds.sound_cache),
+            "bytes": deep_sizeof(sounds.sound_cache),
+        }
+
+    animations = sys.modules.get("animations")
+    if animations is not None:
+        info = animations.celebration_html.cache_info()
+        caches["animations.celebration_html"] = {
+            "entries": info.currsize,
+            "max_entries": info.maxsize,
+        }
+
+    pyplot = sys.modules.get("matplotlib.pyplot")
+    if pyplot is not None:
+        caches["matplotlib.open_figures"] = {"entries": len(pyplot.get_fignums())}
+
+    return caches
+
+class MemoryProfiler:
+    """Process-wide tracemalloc profiler recording one snapshot per rerun."""
+
+    def __init__(self, frames=1, top=15, history=50):
+        self.frames = frames
+        self.top = top
+        self.history = collections.deque(maxlen=history)
+        self.sessions = collections.OrderedDict()
+        self._previous = None
+        self._growth = []
+
+    @property
+    def enabled(self):
+        return tracemalloc.is_tracing()
+
+    def start(self):
+        """Start tracing allocations."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+        self._previous = None
+
+    def stop(self):
+        """Stop tracing and drop the last snapshot."""
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._previous = None
+        self._growth = []
+
+    def record(self, label="rerun"):
+        """
+        Take a snapshot and diff it against the previous one.
+
+        Args:
+            label: Name of the rerun being recorded
+        """
+        if not self.enabled:
+            return
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        if self._previous is not None:
+            self._growth = [
+                {"location": str(stat.traceback[0]), "size_diff": stat.size_diff,
+                 "count_diff": stat.count_diff, "size": stat.size}
+                for stat in snapshot.compare_to(self._previous, "lineno")[:self.top]
+            ]
+        self._previous = snapshot
+
+        current, peak = tracemalloc.get_traced_memory()
+        self.history.append({"label": label, "time": time.time(), "traced": current, "peak": peak})
+
+    def record_session(self, session_id, session_state):
+        """Remember the estimated state size of a session."""
+        sizes = session_state_sizes(session_state)
+        self.sessions.pop(session_id, None)
+        self.sessions[session_id] = {"time": time.time(), "bytes": sum(sizes.values()), "keys": sizes}
+        while len(self.sessions) > SESSION_REGISTRY_LIMIT:
+            self.sessions.popitem(last=False)
+
+    def report(self):
+        """Collect everything recorded so far into a JSON-serializable dictionary."""
+        return {
+            "tracing": self.enabled,
+            "reruns": list(self.history),
+            "growth_since_last_rerun": self._growth,
+            "sessions": dict(self.sessions),
+            "module_caches": module_cache_sizes(),
+        }
+
+# Global profiler shared by all sessions of the app process
+profiler = MemoryProfiler()
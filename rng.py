@@ -0,0 +1,100 @@
+"""
+Random number generators for the prize drawing application.
+
+Drawing code takes any object with the NumPy Generator methods it uses
+(integers, random and standard_exponential), so the source of randomness
+can be swapped without touching the samplers:
+
+- "standard": NumPy's PCG64 generator, seedable for reproducible draws
+- "secure": operating system entropy (os.urandom), fetched in large blocks
+  so bulk draws do not pay a system call per number
+"""
+import os
+import threading
+
+import numpy as np
+
+RNG_MODES = ("standard", "secure")
+
+# Bytes of OS entropy fetched per refill
+ENTROPY_BLOCK_SIZE = 1 << 16
+
+class BufferedSecureRandom:
+    """
+    Cryptographically secure generator backed by buffered OS entropy.
+
+    Implements the subset of numpy.random.Generator used by the samplers.
+    Bounded integers are drawn by masked rejection sampling, so every value
+    in the range is exactly equally likely.
+    """
+
+    def __init__(self, block_size=ENTROPY_BLOCK_SIZE):
+        self.block_size = block_size
+        self._buffer = np.empty(0, dtype=np.uint64)
+        self._position = 0
+        self._lock = threading.Lock()
+
+    def _words(self, count):
+        """Take count random 64-bit words from the entropy buffer."""
+        with self._lock:
+            if self._position + count > len(self._buffer):
+                remaining = self._buffer[self._position:]
+                fetch = max(self.block_size, (count - len(remaining)) * 8)
+                fresh = np.frombuffer(os.urandom(fetch - fetch % 8), dtype=np.uint64)
+                self._buffer = np.concatenate((remaining, fresh))
+                self._position = 0
+            words = self._buffer[self._position:self._position + count]
+            self._position += count
+            return words
+
+    def integers(self, low, high=None, size=None):
+        """Draw integers uniformly from [low, high), or [0, low) without high."""
+        if high is None:
+            low, high = 0, low
+        span = int(high) - int(low)
+        if span <= 0:
+            raise ValueError("high must be greater than low")
+
+        count = 1 if size is None else int(np.prod(size))
+        mask = np.uint64((1 << (span - 1).bit_length()) - 1)
+        accepted = np.empty(0, dtype=np.uint64)
+        while len(accepted) < count:
+            # At least half of the masked words fall inside the range
+            words = self._words(2 * (count - len(accepted)) + 8) & mask
+            accepted = np.concatenate((accepted, words[words < np.uint64(span)]))
+
+        values = accepted[:count].astype(np.int64) + int(low)
+        return int(values[0]) if size is None else values.reshape(size)
+
+    def random(self, size=None):
+        """Draw floats uniformly from [0, 1) with 53 bits of precision."""
+        count = 1 if size is None else int(np.prod(size))
+        values = (self._words(count) >> np.uint64(11)) * (1.0 / (1 << 53))
+        return float(values[0]) if size is None else values.reshape(size)
+
+    def standard_exponential(self, size=None):
+        """Draw from the standard exponential distribution."""
+        values = -np.log1p(-self.random(size))
+        return float(values) if size is None else values
+
+# One shared secure generator, so its entropy buffer is reused across draws
+secure_rng = BufferedSecureRandom()
+
+def get_rng(mode="standard", seed=None):
+    """
+    Return a random generator for drawing.
+
+    Args:
+        mode: "standard" or "secure"
+        seed: Seed for reproducible standard draws
+
+    Returns:
+        An object with the numpy.random.Generator drawing methods
+    """
+    if mode == "secure":
+        if seed is not None:
+            raise ValueError("Secure draws cannot be seeded")
+        return secure_rng
+    if mode != "standard":
+        raise ValueError(f"Unknown random mode: {mode}")
+    return np.random.default_rng(seed)
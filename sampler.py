@@ -0,0 +1,150 @@
+"""
+Weighted sampling for the prize drawing application.
+
+Samplers are built once from the participants' ticket counts and then draw
+with vectorized NumPy operations, so a draw never expands a list with one
+entry per ticket.
+"""
+import numpy as np
+
+# Largest ticket total a drawing can hold; ticket numbers are int64
+MAX_TOTAL_TICKETS = np.iinfo(np.int64).max
+
+def ticket_total(tickets):
+    """
+    Sum ticket counts exactly, without int64 wraparound.
+
+    Args:
+        tickets: Array-like of non-negative ticket counts
+
+    Returns:
+        The total as a Python int
+    """
+    tickets = np.asarray(tickets, dtype=np.int64)
+    if len(tickets) == 0:
+        return 0
+    # The vectorized sum cannot overflow while max * count fits in int64
+    if int(tickets.max()) * len(tickets) <= MAX_TOTAL_TICKETS:
+        return int(tickets.sum())
+    return sum(tickets.tolist())
+
+def _sampling_keys(tickets, rng):
+    """
+    Exponential sort keys for weighted sampling without replacement.
+
+    Taking the k smallest keys yields a weighted sample of k distinct
+    entries (Efraimidis-Spirakis). Entries without tickets get an infinite
+    key and are never selected.
+    """
+    keys = np.full(len(tickets), np.inf)
+    np.divide(rng.standard_exponential(len(tickets)), tickets, out=keys, where=tickets > 0)
+    return keys
+
+class TicketSampler:
+    """
+    Draw participant indices proportionally to their ticket counts.
+
+    Memory and draw time depend on the number of participants only: a
+    ticket number is drawn from [0, total) and located by binary search in
+    the cumulative ticket counts.
+    """
+
+    def __init__(self, tickets):
+        self.tickets = np.asarray(tickets, dtype=np.int64)
+        if ticket_total(self.tickets) > MAX_TOTAL_TICKETS:
+            raise ValueError("Total number of tickets exceeds the int64 range")
+        self.cumulative = np.cumsum(self.tickets)
+        self.total = int(self.cumulative[-1]) if len(self.cumulative) else 0
+
+    @classmethod
+    def from_participants(cls, participants):
+        """Build a sampler from a list of participant dictionaries."""
+        return cls([p["tickets"] for p in participants])
+
+    def draw(self, rng, size=None):
+        """
+        Draw participant indices with replacement.
+
+        Args:
+            rng: Random generator from rng.get_rng
+            size: Number of draws, or None for a single index
+
+        Returns:
+            An index, or an array of indices when size is given
+        """
+        if self.total <= 0:
+            raise ValueError("No tickets to draw from")
+        ticket_numbers = rng.integers(0, self.total, size=size)
+        return np.searchsorted(self.cumulative, ticket_numbers, side="right")
+
+    def draw_unique(self, rng, count):
+        """
+        Draw up to count distinct participant indices, weighted by tickets.
+
+        Args:
+            rng: Random generator from rng.get_rng
+            count: Number of winners wanted
+
+        Returns:
+            Array of indices in drawing order
+        """
+        keys = _sampling_keys(self.tickets, rng)
+        count = min(count, int(np.count_nonzero(self.tickets > 0)))
+        if count <= 0:
+            return np.empty(0, dtype=np.int64)
+        chosen = np.argpartition(keys, count - 1)[:count]
+        return chosen[np.argsort(keys[chosen])]
+
+class StratifiedSampler:
+    """Draw a fixed number of distinct winners from each group in one pass."""
+
+    def __init__(self, tickets, groups):
+        self.tickets = np.asarray(tickets, dtype=np.int64)
+        self.groups, self.codes = np.unique(np.asarray(groups, dtype=str), return_inverse=True)
+        self.codes = self.codes.ravel()
+        self.sizes = np.bincount(self.codes, minlength=len(self.groups))
+
+    @classmethod
+    def from_participants(cls, participants):
+        """Build a sampler from participant dictionaries with an optional group."""
+        return cls(
+            [p["tickets"] for p in participants],
+            [p.get("group") or "" for p in participants]
+        )
+
+    def draw(self, quotas, rng, mask=None):
+        """
+        Draw winners for every group at once.
+
+        Args:
+            quotas: Dictionary mapping group name to number of winners
+            rng: Random generator from rng.get_rng
+            mask: Optional boolean array of eligible participants
+
+        Returns:
+            Dictionary mapping group name to an array of participant indices
+            in drawing order
+        """
+        quota = np.zeros(len(self.groups), dtype=np.int64)
+        positions = np.searchsorted(self.groups, list(quotas))
+        for position, (group, count) in zip(positions, quotas.items()):
+            if position < len(self.groups) and self.groups[position] == group:
+                quota[position] = count
+
+        # Order by group, then by sampling key; the first quota entries of
+        # each group are its winners
+        tickets = self.tickets if mask is None else np.where(mask, self.tickets, 0)
+        keys = _sampling_keys(tickets, rng)
+        order = np.lexsort((keys, self.codes))
+        sorted_codes = self.codes[order]
+        starts = np.concatenate(([0], np.cumsum(self.sizes)[:-1]))
+        rank = np.arange(len(order)) - starts[sorted_codes]
+        selected = (rank < quota[sorted_codes]) & np.isfinite(keys[order])
+
+        winners = order[selected]
+        bounds = np.searchsorted(sorted_codes[selected], np.arange(len(self.groups) + 1))
+        return {
+            str(group): winners[bounds[i]:bounds[i + 1]]
+            for i, group in enumerate(self.groups)
+            if quota[i] > 0
+        }
@@ -0,0 +1,54 @@
+import tracemalloc
+
+import numpy as np
+
+from rng import get_rng
+from sampler import TicketSampler, ticket_total
+
+ENTRIES = 10_000
+TOTAL = 10 ** 10
+
+def large_tickets():
+    """10k ticket counts summing to exactly 10**10."""
+    tickets = np.full(ENTRIES, TOTAL // ENTRIES, dtype=np.int64)
+    tickets[:ENTRIES // 2] -= 123_456
+    tickets[ENTRIES // 2:] += 123_456
+    return tickets
+
+def test_large_total_is_exact():
+    sampler = TicketSampler(large_tickets())
+    assert sampler.total == TOTAL
+    assert ticket_total(sampler.tickets) == TOTAL
+    assert int(sampler.cumulative[-1]) == TOTAL
+
+def test_draw_indices_in_range():
+    sampler = TicketSampler(large_tickets())
+    rng = get_rng(seed=7)
+    indices = sampler.draw(rng, size=5_000)
+    assert indices.min() >= 0 and indices.max() < ENTRIES
+    assert 0 <= int(sampler.draw(rng)) < ENTRIES
+
+    unique = sampler.draw_unique(rng, 100)
+    assert len(set(unique.tolist())) == 100
+    assert unique.min() >= 0 and unique.max() < ENTRIES
+
+def test_secure_draw_indices_in_range():
+    sampler = TicketSampler(large_tickets())
+    indices = sampler.draw(get_rng("secure"), size=1_000)
+    assert indices.min() >= 0 and indices.max() < ENTRIES
+
+def test_no_per_ticket_allocation():
+    tickets = large_tickets()
+    tracemalloc.start()
+    try:
+        sampler = TicketSampler(tickets)
+        sampler.draw(get_rng(seed=1), size=1_000)
+        sampler.draw_unique(get_rng(seed=1), 10)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    # Memory scales with participants: a few int64 or float64 arrays per entry
+    assert sampler.cumulative.shape == (ENTRIES,)
+    assert peak < 64 * ENTRIES
+    assert peak < TOTAL // 1000
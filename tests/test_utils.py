@@ -0,0 +1,15 @@
+from utils import load_from_csv
+
+def test_na_like_names_are_kept():
+    participants, report = load_from_csv(
+        "name,tickets\nNA,1\nnull,2\nNone,3\n,4\n", with_report=True
+    )
+    assert [p["name"] for p in participants] == ["NA", "null", "None"]
+    assert report["rows_in"] == 4
+    assert report["rows_dropped"] == 1
+
+def test_last_policy_keeps_whole_last_row():
+    participants = load_from_csv(
+        "name,tickets,group\nLulu,3,A\n lulu ,4,C\n", merge_policy="last"
+    )
+    assert participants == [{"name": "lulu", "tickets": 4, "group": "C"}]
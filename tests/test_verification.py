@@ -0,0 +1,71 @@
+import copy
+
+from verification import ParticipantDigest, commit_draw, draw_committed, verify_draw
+
+def participants(count, prefix="p"):
+    return [{"name": f"{prefix}{i}", "tickets": i % 5 + 1} for i in range(count)]
+
+def test_append_fills_freed_slot():
+    people = participants(4)
+    digest = ParticipantDigest(people)
+    people.pop(1)
+    digest.delete(1)
+    newcomer = {"name": "new", "tickets": 9}
+    people.append(newcomer)
+    digest.append(newcomer)
+
+    assert digest.slots == [0, 2, 3, 1]
+    assert digest.capacity == 4 and digest.next_slot == 4
+    assert digest.total == sum(p["tickets"] for p in people)
+    assert ParticipantDigest.from_slots(digest.snapshot(people)).root == digest.root
+
+def test_grow_matches_fresh_build():
+    people = participants(4)
+    digest = ParticipantDigest(people)
+    for person in participants(3, prefix="q"):
+        people.append(person)
+        digest.append(person)
+
+    assert digest.capacity == 8
+    assert digest.root == ParticipantDigest(people).root
+    assert digest.total == sum(p["tickets"] for p in people)
+
+def test_snapshot_round_trip_with_empty_slots():
+    people = participants(6)
+    digest = ParticipantDigest(people)
+    for index in (4, 0):
+        people.pop(index)
+        digest.delete(index)
+    people[1] = {"name": "edited", "tickets": 7, "group": "A"}
+    digest.update(1, people[1])
+
+    snapshot = digest.snapshot(people)
+    assert snapshot[0] is None and snapshot[4] is None
+    rebuilt = ParticipantDigest.from_slots(snapshot)
+    assert rebuilt.root == digest.root
+    assert rebuilt.total == digest.total
+
+def test_verify_draw_accepts_and_rejects():
+    people = participants(10)
+    digest = ParticipantDigest(people)
+    commitment, seed = commit_draw(digest)
+    record = draw_committed(digest, people, commitment, seed)
+    assert verify_draw(record)
+
+    tampered = []
+    for key, value in (("ticket", record["ticket"] + 1), ("seed", "00" * 32)):
+        changed = copy.deepcopy(record)
+        changed[key] = value
+        tampered.append(changed)
+    changed = copy.deepcopy(record)
+    changed["winner"]["tickets"] += 1
+    tampered.append(changed)
+    changed = copy.deepcopy(record)
+    changed["winner"]["name"] = "someone else"
+    tampered.append(changed)
+    changed = copy.deepcopy(record)
+    changed["proof"][0]["tickets"] += 1
+    tampered.append(changed)
+
+    for changed in tampered:
+        assert not verify_draw(changed)
@@ -3,15 +3,21 @@ Utility functions for the prize drawing application.
 """
 import pandas as pd
 import io
-import random
 import json
+import unicodedata
 
-def calculate_probabilities(participants):
+from rng import get_rng
+from sampler import TicketSampler, ticket_total, MAX_TOTAL_TICKETS
+
+def calculate_probabilities(participants, total_tickets=None, decimals=2):
     """
     Calculate the drawing probability for each participant.
     
     Args:
         participants: List of dictionaries with name and tickets
+        total_tickets: Ticket total of the whole drawing, when participants
+            is only a subset of it (e.g. a list of winners)
+        decimals: Number of decimals of the rounded percentage
         
     Returns:
         List of dictionaries with name, tickets, and probability
@@ -19,7 +25,8 @@ def calculate_probabilities(participants):
     if not participants:
         return []
     
-    total_tickets = sum(p["tickets"] for p in participants)
+    if total_tickets is None:
+        total_tickets = ticket_total([p["tickets"] for p in participants])
     if total_tickets == 0:
         return [{"name": p["name"], "tickets": p["tickets"], "probability": 0} for p in participants]
     
@@ -29,17 +36,18 @@ def calculate_probabilities(participants):
         result.append({
             "name": p["name"],
             "tickets": p["tickets"],
-            "probability": round(probability, 2)
+            "probability": round(probability, decimals)
         })
     
     return result
 
-def select_winner(participants):
+def select_winner(participants, rng=None):
     """
     Select a winner based on ticket distribution.
     
     Args:
         participants: List of dictionaries with name and tickets
+        rng: Random generator from rng.get_rng (standard mode by default)
         
     Returns:
         Dictionary with the winner's name and tickets
@@ -47,24 +55,32 @@ def select_winner(participants):
     if not participants:
         return None
     
-    # Create a pool of tickets where each participant appears according to their ticket count
-    ticket_pool = []
-    for p in participants:
-        ticket_pool.extend([p["name"]] * p["tickets"])
+    if rng is None:
+        rng = get_rng()
     
-    if not ticket_pool:
+    sampler = TicketSampler.from_participants(participants)
+    if sampler.total <= 0:
         # If no tickets, select randomly from the participants
-        return random.choice(participants)
+        return participants[rng.integers(len(participants))]
     
-    # Select a random ticket
-    winning_name = random.choice(ticket_pool)
+    return participants[sampler.draw(rng)]
+
+def group_participants(participants):
+    """
+    Count participants per group.
     
-    # Find the participant with the winning name
+    Args:
+        participants: List of dictionaries with name, tickets and optional group
+        
+    Returns:
+        Dictionary mapping group name to number of participants, or an
+        empty dictionary when no participant has a group
+    """
+    counts = {}
     for p in participants:
-        if p["name"] == winning_name:
-            return p
-    
-    return None
+        if p.get("group"):
+            counts[p["group"]] = counts.get(p["group"], 0) + 1
+    return counts
 
 def save_to_csv(participants):
     """
@@ -84,27 +100,182 @@ def save_to_csv(participants):
     df.to_csv(output, index=False)
     return output.getvalue()
 
-def load_from_csv(csv_content):
+MERGE_POLICIES = ("sum", "max", "last")
+
+# Maximum number of merged names listed in a merge report
+MERGE_REPORT_LIMIT = 1000
+
+def clean_name(name):
+    """
+    Clean a participant name for display and storage.
+    
+    Args:
+        name: Participant name as entered or imported
+        
+    Returns:
+        The name NFKC-normalized and stripped
+    """
+    return unicodedata.normalize("NFKC", str(name)).strip()
+
+def normalize_name(name):
+    """
+    Build the key used to detect duplicate participant names.
+    
+    Args:
+        name: Participant name as entered or imported
+        
+    Returns:
+        The cleaned name, casefolded
+    """
+    return clean_name(name).casefold()
+
+def merge_duplicates(df, policy="sum"):
+    """
+    Merge rows that refer to the same participant.
+    
+    Names are compared after stripping, NFKC normalization and casefolding,
+    so "Lulu", "lulu " and full-width forms collapse into one entry. Rows
+    with a blank name are dropped. The "last" policy keeps the whole last
+    row; the others keep the first row's name and group. The grouping is a
+    single hash group-by, so it stays linear in the row count.
+    
+    Args:
+        df: DataFrame with name and tickets columns, and optionally group
+        policy: How to combine tickets of duplicates ("sum", "max" or "last")
+        
+    Returns:
+        Tuple of (merged DataFrame, merge report dictionary)
+    """
+    if policy not in MERGE_POLICIES:
+        raise ValueError(f"Unknown merge policy: {policy}")
+    
+    rows_in = len(df)
+    names = df["name"].where(df["name"].notna(), "").astype(str).str.normalize("NFKC").str.strip()
+    df = df.assign(name=names, _key=names.str.casefold())
+    df = df[df["_key"] != ""]
+    
+    row_choice = "last" if policy == "last" else "first"
+    aggregations = {
+        "name": ("name", row_choice),
+        "tickets": ("tickets", policy),
+        "_rows": ("tickets", "size"),
+    }
+    if "group" in df.columns:
+        aggregations["group"] = ("group", row_choice)
+    
+    grouped = df.groupby("_key", sort=False)
+    merged = grouped.agg(**aggregations).reset_index(drop=True)
+    
+    duplicates = merged[merged["_rows"] > 1]
+    listed = duplicates.head(MERGE_REPORT_LIMIT)
+    report = {
+        "policy": policy,
+        "rows_in": int(rows_in),
+        "rows_dropped": int(rows_in - len(df)),
+        "participants_out": int(len(merged)),
+        "rows_merged": int(len(df) - len(merged)),
+        "names_merged": int(len(duplicates)),
+        "merged_names": [
+            {"name": name, "rows": int(rows), "tickets": int(tickets)}
+            for name, rows, tickets in zip(
+                listed["name"], listed["_rows"], listed["tickets"]
+            )
+        ],
+    }
+    return merged.drop(columns="_rows"), report
+
+def load_from_csv(csv_content, merge_policy="sum", with_report=False):
     """
     Load participants from CSV content.
     
+    An optional group column (e.g. department or team) is kept for
+    stratified drawings.
+    
     Args:
         csv_content: CSV string
+        merge_policy: How to combine tickets of duplicate names
+            ("sum", "max" or "last")
+        with_report: Also return the duplicate merge report
         
     Returns:
-        List of dictionaries with name and tickets
+        List of dictionaries with name, tickets and optionally group, or a
+        (participants, report) tuple when with_report is set
     """
     try:
-        df = pd.read_csv(io.StringIO(csv_content))
-        if 'name' not in df.columns or 'tickets' not in df.columns:
-            return None
+        df, report = read_participants(io.StringIO(csv_content), merge_policy)
+        if df is None:
+            return (None, None) if with_report else None
         
-        participants = []
-        for _, row in df.iterrows():
-            participants.append({
-                "name": row['name'],
-                "tickets": int(row['tickets'])
-            })
-        return participants
+        participants = df.to_dict("records")
+        return (participants, report) if with_report else participants
     except Exception:
-        return None
+        return (None, None) if with_report else None
+
+def load_from_parquet(parquet_content, merge_policy="sum", with_report=False):
+    """
+    Load participants from Parquet content.
+    
+    Args:
+        parquet_content: Parquet file bytes
+        merge_policy: How to combine tickets of duplicate names
+            ("sum", "max" or "last")
+        with_report: Also return the duplicate merge report
+        
+    Returns:
+        Same as load_from_csv
+    """
+    try:
+        df, report = read_participants(io.BytesIO(parquet_content), merge_policy, file_format="parquet")
+        if df is None:
+            return (None, None) if with_report else None
+        
+        participants = df.to_dict("records")
+        return (participants, report) if with_report else participants
+    except Exception:
+        return (None, None) if with_report else None
+
+def read_participants(source, merge_policy="sum", file_format="csv"):
+    """
+    Read a participants file into a merged DataFrame.
+    
+    Only the name, tickets and group columns are parsed, so large files
+    are read in a single pass by the pandas C parser. Ticket counts are
+    int64 and must not be negative.
+    
+    Args:
+        source: File path or file-like object
+        merge_policy: How to combine tickets of duplicate names
+        file_format: "csv" or "parquet" (Parquet needs pyarrow)
+        
+    Returns:
+        Tuple of (DataFrame, merge report), or (None, None) when the
+        name or tickets column is missing
+    """
+    if file_format == "parquet":
+        df = pd.read_parquet(source)
+        df = df[[c for c in df.columns if c in ("name", "tickets", "group")]]
+    else:
+        df = pd.read_csv(
+            source,
+            usecols=lambda column: column in ("name", "tickets", "group"),
+            dtype={"name": str, "group": str},
+            # Names such as "NA" or "null" are real names, not missing values
+            keep_default_na=False
+        )
+    if 'name' not in df.columns or 'tickets' not in df.columns:
+        return None, None
+    
+    df["tickets"] = df["tickets"].astype("int64")
+    if (df["tickets"] < 0).any():
+        raise ValueError("Ticket counts must not be negative")
+    if "group" in df.columns:
+        df["group"] = df["group"].fillna("").astype(str).str.strip()
+    
+    # Checking the raw total first also rules out overflow in the "sum" merge
+    check_before_merge = merge_policy == "sum"
+    if check_before_merge and ticket_total(df["tickets"].to_numpy()) > MAX_TOTAL_TICKETS:
+        raise ValueError("Total number of tickets exceeds the int64 range")
+    df, report = merge_duplicates(df, merge_policy)
+    if not check_before_merge and ticket_total(df["tickets"].to_numpy()) > MAX_TOTAL_TICKETS:
+        raise ValueError("Total number of tickets exceeds the int64 range")
+    return df, report
@@ -0,0 +1,324 @@
+"""
+Verifiable drawings for the prize drawing application.
+
+The participant list is hashed into a Merkle sum tree: every node stores the
+hash of its children together with their ticket total. Editing one
+participant rehashes only the path to the root, O(log n), and the ticket
+totals let a winning ticket be located, and proven, without expanding a
+ticket pool.
+
+Drawing flow:
+
+1. commit_draw publishes the tree root, the ticket total and the hash of a
+   secret seed before drawing.
+2. draw_committed reveals the seed, derives the winning ticket from it and
+   records the winner with an inclusion proof.
+3. verify_draw lets anyone replay the record against the commitment in
+   O(log n), without the participant list.
+"""
+import hashlib
+import heapq
+import json
+import secrets
+import sys
+
+import numpy as np
+
+LEAF_PREFIX = b"\x00"
+NODE_PREFIX = b"\x01"
+DRAW_PREFIX = b"prize-draw"
+
+# Hash of an empty slot (deleted participant or unused capacity)
+EMPTY_HASH = bytes(32)
+
+def leaf_hash(participant):
+    """Hash a participant's name, tickets and group in canonical JSON form."""
+    data = {"name": str(participant["name"]), "tickets": int(participant["tickets"])}
+    if participant.get("group"):
+        data["group"] = str(participant["group"])
+    encoded = json.dumps(data, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(LEAF_PREFIX + encoded.encode("utf-8")).digest()
+
+def node_hash(left, right, total):
+    """Hash two child nodes together with their combined ticket total."""
+    return hashlib.sha256(NODE_PREFIX + left + right + int(total).to_bytes(16, "big")).digest()
+
+class ParticipantDigest:
+    """
+    Merkle sum tree over the participant list, updated in place on edits.
+
+    Participants are stored in slots. Deleting empties a slot and appending
+    fills the lowest empty slot, or the next unused one, so the other
+    participants keep their slots, no other leaf needs rehashing, and the
+    capacity only grows when every slot is taken.
+    """
+
+    def __init__(self, participants=()):
+        participants = list(participants)
+        self.capacity = 1
+        while self.capacity < len(participants):
+            self.capacity *= 2
+        self.hashes = np.zeros((2 * self.capacity, 32), dtype=np.uint8)
+        self.sums = np.zeros(2 * self.capacity, dtype=np.int64)
+        self.slots = list(range(len(participants)))
+        self.next_slot = len(participants)
+        self.free_slots = []
+
+        # Hash the tree level by level, writing each level in one assignment
+        hashes = [leaf_hash(p) for p in participants]
+        hashes += [EMPTY_HASH] * (self.capacity - len(hashes))
+        sums = np.zeros(self.capacity, dtype=np.int64)
+        sums[:len(participants)] = [p["tickets"] for p in participants]
+        start = self.capacity
+        while start:
+            self.hashes[start:2 * start] = np.frombuffer(b"".join(hashes), dtype=np.uint8).reshape(-1, 32)
+            self.sums[start:2 * start] = sums
+            sums = sums[0::2] + sums[1::2]
+            hashes = [node_hash(left, right, total)
+                      for left, right, total in zip(hashes[0::2], hashes[1::2], sums.tolist())]
+            start //= 2
+
+    @classmethod
+    def from_slots(cls, slots):
+        """Rebuild a digest from a published slot list, with None for empty slots."""
+        digest = cls([p if p is not None else {"name": "", "tickets": 0} for p in slots])
+        for slot, participant in enumerate(slots):
+            if participant is None:
+                digest._set_leaf(slot, None)
+                digest._update_path(slot)
+        digest.slots = [slot for slot, p in enumerate(slots) if p is not None]
+        digest.free_slots = [slot for slot, p in enumerate(slots) if p is None]
+        return digest
+
+    @property
+    def root(self):
+        return self.hashes[1].tobytes()
+
+    @property
+    def total(self):
+        return int(self.sums[1])
+
+    def _set_leaf(self, slot, participant):
+        node = self.capacity + slot
+        if participant is None:
+            self.hashes[node] = np.frombuffer(EMPTY_HASH, dtype=np.uint8)
+            self.sums[node] = 0
+        else:
+            self.hashes[node] = np.frombuffer(leaf_hash(participant), dtype=np.uint8)
+            self.sums[node] = participant["tickets"]
+
+    def _rehash(self, node):
+        left, right = 2 * node, 2 * node + 1
+        self.sums[node] = self.sums[left] + self.sums[right]
+        self.hashes[node] = np.frombuffer(
+            node_hash(self.hashes[left].tobytes(), self.hashes[right].tobytes(), self.sums[node]),
+            dtype=np.uint8
+        )
+
+    def _update_path(self, slot):
+        node = (self.capacity + slot) // 2
+        while node:
+            self._rehash(node)
+            node //= 2
+
+    def _grow(self):
+        """Double the capacity; the old tree becomes the left subtree of the new root."""
+        old_hashes, old_sums, old_capacity = self.hashes, self.sums, self.capacity
+        self.capacity *= 2
+        self.hashes = np.zeros((2 * self.capacity, 32), dtype=np.uint8)
+        self.sums = np.zeros(2 * self.capacity, dtype=np.int64)
+
+        # Copy each level of the old tree into the left half of the new level;
+        # the right half is an empty subtree of the same height
+        empty = EMPTY_HASH
+        level_size = old_capacity
+        while level_size:
+            start = 2 * level_size
+            self.hashes[start:start + level_size] = old_hashes[level_size:2 * level_size]
+            self.sums[start:start + level_size] = old_sums[level_size:2 * level_size]
+            self.hashes[start + level_size:2 * start] = np.frombuffer(empty, dtype=np.uint8)
+            empty = node_hash(empty, empty, 0)
+            level_size //= 2
+        self._rehash(1)
+
+    def append(self, participant):
+        """Add a participant at the end of the list."""
+        if self.free_slots:
+            slot = heapq.heappop(self.free_slots)
+        else:
+            if self.next_slot == self.capacity:
+                self._grow()
+            slot = self.next_slot
+            self.next_slot += 1
+        self.slots.append(slot)
+        self._set_leaf(slot, participant)
+        self._update_path(slot)
+
+    def update(self, index, participant):
+        """Replace the participant at a list index."""
+        slot = self.slots[index]
+        self._set_leaf(slot, participant)
+        self._update_path(slot)
+
+    def delete(self, index):
+        """Remove the participant at a list index, leaving an empty slot."""
+        slot = self.slots.pop(index)
+        heapq.heappush(self.free_slots, slot)
+        self._set_leaf(slot, None)
+        self._update_path(slot)
+
+    def find(self, ticket):
+        """Return the slot holding a ticket number in [0, total)."""
+        node = 1
+        while node < self.capacity:
+            left = 2 * node
+            if ticket < self.sums[left]:
+                node = left
+            else:
+                ticket -= int(self.sums[left])
+                node = left + 1
+        return node - self.capacity
+
+    def proof(self, slot):
+        """Sibling hashes and ticket totals from a leaf up to the root."""
+        path = []
+        node = self.capacity + slot
+        while node > 1:
+            sibling = node ^ 1
+            path.append({
+                "hash": self.hashes[sibling].tobytes().hex(),
+                "tickets": int(self.sums[sibling]),
+                "left": bool(sibling < node)
+            })
+            node //= 2
+        return path
+
+    def snapshot(self, participants):
+        """Slot list to publish with a commitment, with None for empty slots."""
+        slots = [None] * self.next_slot
+        for index, slot in enumerate(self.slots):
+            slots[slot] = participants[index]
+        return slots
+
+def derive_ticket(seed, root, total, draw=0):
+    """
+    Derive a winning ticket number in [0, total) from the revealed seed.
+
+    Hash output is masked to the bit length of the total and rejected when
+    out of range, so every ticket is equally likely.
+    """
+    if total <= 0:
+        raise ValueError("No tickets to draw from")
+    mask = (1 << (total - 1).bit_length()) - 1
+    counter = 0
+    while True:
+        value = int.from_bytes(hashlib.sha256(
+            DRAW_PREFIX + seed + root + draw.to_bytes(8, "big") + counter.to_bytes(8, "big")
+        ).digest(), "big") & mask
+        if value < total:
+            return value
+        counter += 1
+
+def commit_draw(digest):
+    """
+    Commit to the current participant list and a fresh secret seed.
+
+    Args:
+        digest: ParticipantDigest of the participant list
+
+    Returns:
+        Tuple of (public commitment dictionary, secret seed bytes)
+    """
+    seed = secrets.token_bytes(32)
+    commitment = {
+        "root": digest.root.hex(),
+        "total_tickets": digest.total,
+        "seed_hash": hashlib.sha256(seed).hexdigest()
+    }
+    return commitment, seed
+
+def draw_committed(digest, participants, commitment, seed, draw=0):
+    """
+    Reveal the seed and draw a winner against a commitment.
+
+    Args:
+        digest: ParticipantDigest of the participant list
+        participants: The participant list the digest was built from
+        commitment: Commitment returned by commit_draw
+        seed: Secret seed returned by commit_draw
+        draw: Draw number, for several winners from one commitment
+
+    Returns:
+        Draw record with the winner, the revealed seed and an inclusion proof
+    """
+    if digest.root.hex() != commitment["root"]:
+        raise ValueError("Participant list changed since the commitment")
+
+    ticket = derive_ticket(seed, digest.root, digest.total, draw)
+    slot = digest.find(ticket)
+    winner = participants[digest.slots.index(slot)]
+    return {
+        **commitment,
+        "seed": seed.hex(),
+        "draw": draw,
+        "ticket": ticket,
+        "winner": {key: winner[key] for key in ("name", "tickets", "group") if winner.get(key)},
+        "proof": digest.proof(slot)
+    }
+
+def verify_draw(record):
+    """
+    Replay a draw record against its commitment.
+
+    Checks that the seed matches the committed hash, that the ticket follows
+    from the seed, and that the proof places the ticket inside the winner's
+    range of the committed tree. Runs in O(log n).
+    """
+    seed = bytes.fromhex(record["seed"])
+    root = bytes.fromhex(record["root"])
+    if hashlib.sha256(seed).hexdigest() != record["seed_hash"]:
+        return False
+    if derive_ticket(seed, root, record["total_tickets"], record["draw"]) != record["ticket"]:
+        return False
+
+    node, total = leaf_hash(record["winner"]), int(record["winner"]["tickets"])
+    offset = 0
+    for sibling in record["proof"]:
+        sibling_hash = bytes.fromhex(sibling["hash"])
+        if sibling["left"]:
+            offset += sibling["tickets"]
+            node = node_hash(sibling_hash, node, total + sibling["tickets"])
+        else:
+            node = node_hash(node, sibling_hash, total + sibling["tickets"])
+        total += sibling["tickets"]
+
+    return (node == root and total == record["total_tickets"]
+            and offset <= record["ticket"] < offset + int(record["winner"]["tickets"]))
+
+def main(argv=None):
+    """Verify draw records from the command line, optionally against a snapshot."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Verify published prize draw records.")
+    parser.add_argument("records", help="JSON file with the draw records")
+    parser.add_argument("--snapshot", help="published participant snapshot to check the root against")
+    args = parser.parse_args(argv)
+
+    with open(args.records, encoding="utf-8") as f:
+        records = json.load(f)
+
+    roots = set()
+    if args.snapshot:
+        with open(args.snapshot, encoding="utf-8") as f:
+            roots.add(ParticipantDigest.from_slots(json.load(f)).root.hex())
+
+    ok = True
+    for record in records:
+        valid = verify_draw(record) and (not roots or record["root"] in roots)
+        ok &= valid
+        print(f"draw {record['draw'] + 1}: {record['winner']['name']} "
+              f"(ticket {record['ticket']}) {'OK' if valid else 'FAILED'}")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())